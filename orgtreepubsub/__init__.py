@@ -1,4 +1,6 @@
-from .orgtreepubsub import OrgCrawler
+from .account_table import AccountTable
+from .graph_export import CytoscapeWriter, GraphMLWriter
+from .orgtreepubsub import CrawlStatus, OrgCrawler
 from .type_defs import (
     Account,
     Child,
@@ -13,7 +15,11 @@ from .type_defs import (
 
 __all__ = [
     "Account",
+    "AccountTable",
     "Child",
+    "CrawlStatus",
+    "CytoscapeWriter",
+    "GraphMLWriter",
     "Org",
     "Organization",
     "OrgCrawler",
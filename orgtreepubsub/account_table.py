@@ -0,0 +1,260 @@
+import csv
+from datetime import datetime
+from importlib import import_module
+from threading import Lock
+from typing import Any, Dict, List, Optional, Set, TextIO, Tuple
+
+from .orgtreepubsub import OrgCrawler
+from .type_defs import Account, OrgUnit, Parent, Resource, Root, Tag
+
+
+def import_pyarrow(name: str = "pyarrow") -> Any:
+    # pyarrow is an optional dependency with no type information, so it is
+    # imported lazily and used as Any.
+    return import_module(name)
+
+
+class EncodedColumn:
+    """Dictionary-encoded column for strings that repeat across many rows."""
+
+    def __init__(self) -> None:
+        self.codes: List[Optional[int]] = []
+        self.dictionary: List[str] = []
+        self.lookup: Dict[str, int] = {}
+
+    def append(self, value: Optional[str]) -> None:
+        if value is None:
+            self.codes.append(None)
+            return
+        code = self.lookup.get(value)
+        if code is None:
+            code = len(self.dictionary)
+            self.lookup[value] = code
+            self.dictionary.append(value)
+        self.codes.append(code)
+
+    def values(self) -> List[Optional[str]]:
+        dictionary = self.dictionary
+        return [None if code is None else dictionary[code] for code in self.codes]
+
+    def to_arrow(self) -> Any:
+        pyarrow = import_pyarrow()
+
+        return pyarrow.DictionaryArray.from_arrays(
+            pyarrow.array(self.codes, type=pyarrow.int32()),
+            pyarrow.array(self.dictionary, type=pyarrow.string()),
+        )
+
+
+# The path to a parent from its root: the IDs and the names.
+Path = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+
+class AccountTable:
+    """Flat table of accounts built from crawler signals.
+
+    The subscribers only append to column buffers. OU paths and tag columns
+    are resolved once, after the crawl, because the parentage of an OU may
+    arrive after the accounts under it.
+
+    To fill every column, the crawler must publish the roots, the OUs under
+    each parent, the accounts under each parent, and the tags on each account.
+    """
+
+    tag_column_prefix = "tag:"
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.emails: List[str] = []
+        self.statuses = EncodedColumn()
+        self.joined_methods = EncodedColumn()
+        self.joined_timestamps: List[datetime] = []
+        self.rows: Dict[str, int] = {}
+
+        self.parent_of: Dict[str, str] = {}
+        self.parent_names: Dict[str, str] = {}
+        self.roots: Set[str] = set()
+
+        # Tag values by tag key, then by account ID.
+        self.tags: Dict[str, Dict[str, str]] = {}
+
+    def connect(self, crawler: OrgCrawler) -> None:
+        crawler.on_root.connect(self.on_root)
+        crawler.on_orgunit.connect(self.on_orgunit)
+        crawler.on_account.connect(self.on_account)
+        crawler.on_parentage.connect(self.on_parentage)
+        crawler.on_tag.connect(self.on_tag)
+
+    def on_root(self, sender: OrgCrawler, resource: Root) -> None:
+        with self.lock:
+            self.roots.add(resource.id)
+            self.parent_names[resource.id] = resource.name
+
+    def on_orgunit(self, sender: OrgCrawler, resource: OrgUnit) -> None:
+        with self.lock:
+            self.parent_names[resource.id] = resource.name
+
+    def on_account(self, sender: OrgCrawler, resource: Account) -> None:
+        with self.lock:
+            if resource.id in self.rows:
+                return
+            self.rows[resource.id] = len(self.ids)
+            self.ids.append(resource.id)
+            self.names.append(resource.name)
+            self.emails.append(resource.email)
+            self.statuses.append(resource.status)
+            self.joined_methods.append(resource.joined_method)
+            self.joined_timestamps.append(resource.joined_timestamp)
+
+    def on_parentage(self, sender: OrgCrawler, parent: Parent, child: Resource) -> None:
+        with self.lock:
+            self.parent_of[child.id] = parent.id
+
+    def on_tag(self, sender: OrgCrawler, tag: Tag, resource: Resource) -> None:
+        if not isinstance(resource, Account):
+            return
+        with self.lock:
+            self.tags.setdefault(tag.key, {})[resource.id] = tag.value
+
+    def encoded_columns(self) -> Dict[str, EncodedColumn]:
+        """Return the string columns that repeat across accounts.
+
+        Each path is resolved once per parent, not once per account.
+        """
+        columns: Dict[str, EncodedColumn] = {
+            "status": self.statuses,
+            "joined_method": self.joined_methods,
+        }
+        for name in (
+            "parent_id",
+            "ou_id_path",
+            "ou_name_path",
+            "level_1_ou_id",
+            "level_1_ou_name",
+            "level_2_ou_id",
+            "level_2_ou_name",
+        ):
+            columns[name] = EncodedColumn()
+
+        paths: Dict[str, Path] = {}
+        for account_id in self.ids:
+            parent_id = self.parent_of.get(account_id)
+            ids, names = ((), ()) if parent_id is None else self.path(parent_id, paths)
+            columns["parent_id"].append(parent_id)
+            columns["ou_id_path"].append(format_path(ids))
+            columns["ou_name_path"].append(format_path(names))
+
+            # A path is complete when its first component is a root.
+            complete = len(ids) > 0 and ids[0] in self.roots
+            for level in (1, 2):
+                has_level = complete and len(ids) > level
+                columns[f"level_{level}_ou_id"].append(ids[level] if has_level else None)
+                columns[f"level_{level}_ou_name"].append(names[level] if has_level else None)
+
+        for key in sorted(self.tags):
+            values = self.tags[key]
+            column = EncodedColumn()
+            for account_id in self.ids:
+                column.append(values.get(account_id))
+            columns[f"{self.tag_column_prefix}{key}"] = column
+
+        return columns
+
+    def path(self, parent_id: str, paths: Dict[str, Path]) -> Path:
+        cached = paths.get(parent_id)
+        if cached is not None:
+            return cached
+
+        name = self.parent_names.get(parent_id, "")
+        grandparent_id = self.parent_of.get(parent_id)
+        if grandparent_id is None:
+            result: Path = ((parent_id,), (name,))
+        else:
+            ids, names = self.path(grandparent_id, paths)
+            result = (ids + (parent_id,), names + (name,))
+
+        paths[parent_id] = result
+        return result
+
+    def columns(self) -> Dict[str, List[Any]]:
+        """Return the table as plain Python lists, keyed by column name."""
+        with self.lock:
+            encoded = self.encoded_columns()
+            return self.ordered(
+                {
+                    "id": list(self.ids),
+                    "name": list(self.names),
+                    "email": list(self.emails),
+                    "joined_timestamp": list(self.joined_timestamps),
+                },
+                {name: column.values() for name, column in encoded.items()},
+            )
+
+    def to_arrow(self) -> Any:
+        """Return the table as a pyarrow Table. Requires pyarrow.
+
+        The repeated string columns and the tag columns are dictionary arrays.
+        """
+        pyarrow = import_pyarrow()
+
+        with self.lock:
+            encoded = self.encoded_columns()
+            columns = self.ordered(
+                {
+                    "id": pyarrow.array(self.ids, type=pyarrow.string()),
+                    "name": pyarrow.array(self.names, type=pyarrow.string()),
+                    "email": pyarrow.array(self.emails, type=pyarrow.string()),
+                    "joined_timestamp": pyarrow.array(
+                        self.joined_timestamps, type=pyarrow.timestamp("us", tz="UTC")
+                    ),
+                },
+                {name: column.to_arrow() for name, column in encoded.items()},
+            )
+        return pyarrow.table(list(columns.values()), names=list(columns))
+
+    @staticmethod
+    def ordered(plain: Dict[str, Any], encoded: Dict[str, Any]) -> Dict[str, Any]:
+        columns = {**plain, **encoded}
+        fixed = [
+            "id",
+            "name",
+            "email",
+            "status",
+            "joined_method",
+            "joined_timestamp",
+            "parent_id",
+            "ou_id_path",
+            "ou_name_path",
+            "level_1_ou_id",
+            "level_1_ou_name",
+            "level_2_ou_id",
+            "level_2_ou_name",
+        ]
+        tags = [name for name in encoded if name.startswith(AccountTable.tag_column_prefix)]
+        return {name: columns[name] for name in fixed + tags}
+
+    def write_csv(self, file: TextIO) -> None:
+        """Write the table as CSV with a header row.
+
+        Timestamps are in ISO 8601 format. Missing values are empty cells.
+        """
+        columns = self.columns()
+        columns["joined_timestamp"] = [t.isoformat() for t in columns["joined_timestamp"]]
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        writer.writerows(zip(*columns.values()))
+
+    def write_parquet(self, path: str) -> None:
+        """Write the table as Parquet. Requires pyarrow."""
+        parquet = import_pyarrow("pyarrow.parquet")
+
+        parquet.write_table(self.to_arrow(), path)
+
+
+def format_path(components: Tuple[str, ...]) -> Optional[str]:
+    if not components:
+        return None
+    return f"/{'/'.join(components)}"
@@ -0,0 +1,223 @@
+import json
+from abc import ABC, abstractmethod
+from threading import Lock
+from types import TracebackType
+from typing import Dict, List, Optional, Self, TextIO, Tuple, Type
+from xml.sax.saxutils import escape, quoteattr
+
+from .orgtreepubsub import OrgCrawler
+from .type_defs import Account, Org, OrgUnit, Parent, Resource, Root
+
+
+# Attribute values are scalars so that every graph format can carry them.
+Attributes = Dict[str, str]
+
+
+def organization_attributes(org: Org) -> Attributes:
+    return {
+        "type": "organization",
+        "id": org.id,
+        "arn": org.arn,
+        "feature_set": org.feature_set,
+        "master_account_id": org.master_account_id,
+        "master_account_arn": org.master_account_arn,
+        "master_account_email": org.master_account_email,
+    }
+
+
+def resource_attributes(resource: Resource) -> Attributes:
+    if isinstance(resource, Account):
+        return {
+            "type": "account",
+            "id": resource.id,
+            "arn": resource.arn,
+            "name": resource.name,
+            "email": resource.email,
+            "status": resource.status,
+            "joined_method": resource.joined_method,
+            "joined_timestamp": resource.joined_timestamp.isoformat(),
+        }
+    if isinstance(resource, OrgUnit):
+        return {
+            "type": "organizational_unit",
+            "id": resource.id,
+            "arn": resource.arn,
+            "name": resource.name,
+        }
+    return {
+        "type": "root",
+        "id": resource.id,
+        "arn": resource.arn,
+        "name": resource.name,
+        "policy_types": ",".join(
+            p.type for p in resource.policy_types if p.status == "ENABLED"
+        ),
+    }
+
+
+class GraphWriter(ABC):
+    """Base class for writers that stream the organization graph to a file.
+
+    Each node is written when its resource is published and each edge when its
+    parentage is published, so nothing is held in memory. Use the writer as a
+    context manager around the crawl to write the document header and footer.
+    If the crawl raises, the footer is not written, so a truncated document is
+    not mistaken for a complete one.
+
+    The organization is linked to each root by an edge. The organization and
+    the roots are published by different tasks, so the writer remembers the
+    roots seen before the organization.
+    """
+
+    def __init__(self, file: TextIO) -> None:
+        self.file = file
+        self.lock = Lock()
+        self.organization_id: Optional[str] = None
+        self.unlinked_root_ids: List[str] = []
+
+    def __enter__(self) -> Self:
+        self.file.write(self.header())
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self.file.write(self.footer())
+
+    def connect(self, crawler: OrgCrawler) -> None:
+        crawler.on_organization.connect(self.on_organization)
+        crawler.on_root.connect(self.on_resource)
+        crawler.on_orgunit.connect(self.on_resource)
+        crawler.on_account.connect(self.on_resource)
+        crawler.on_parentage.connect(self.on_parentage)
+
+    def on_organization(self, sender: OrgCrawler, org: Org) -> None:
+        self.write(self.node(organization_attributes(org)))
+        with self.lock:
+            self.organization_id = org.id
+            root_ids, self.unlinked_root_ids = self.unlinked_root_ids, []
+        for root_id in root_ids:
+            self.write(self.edge(org.id, root_id))
+
+    def on_resource(self, sender: OrgCrawler, resource: Resource) -> None:
+        self.write(self.node(resource_attributes(resource)))
+        if isinstance(resource, Root):
+            with self.lock:
+                organization_id = self.organization_id
+                if organization_id is None:
+                    self.unlinked_root_ids.append(resource.id)
+            if organization_id is not None:
+                self.write(self.edge(organization_id, resource.id))
+
+    def on_parentage(self, sender: OrgCrawler, parent: Parent, child: Resource) -> None:
+        self.write(self.edge(parent.id, child.id))
+
+    def write(self, text: str) -> None:
+        with self.lock:
+            self.file.write(text)
+
+    @abstractmethod
+    def header(self) -> str:
+        ...
+
+    @abstractmethod
+    def footer(self) -> str:
+        ...
+
+    @abstractmethod
+    def node(self, attributes: Attributes) -> str:
+        ...
+
+    @abstractmethod
+    def edge(self, source: str, target: str) -> str:
+        ...
+
+
+class GraphMLWriter(GraphWriter):
+    """Stream the organization graph as GraphML.
+
+    Every attribute has a declared key. GraphML has no timestamp type, so
+    timestamps are ISO 8601 strings. Root policy types are a comma-separated
+    list of the enabled types.
+    """
+
+    # Attribute name and GraphML type of every node key.
+    keys: Tuple[Tuple[str, str], ...] = (
+        ("type", "string"),
+        ("id", "string"),
+        ("arn", "string"),
+        ("name", "string"),
+        ("email", "string"),
+        ("status", "string"),
+        ("joined_method", "string"),
+        ("joined_timestamp", "string"),
+        ("policy_types", "string"),
+        ("feature_set", "string"),
+        ("master_account_id", "string"),
+        ("master_account_arn", "string"),
+        ("master_account_email", "string"),
+    )
+
+    def header(self) -> str:
+        keys = "".join(
+            f'  <key id={quoteattr(name)} for="node" attr.name={quoteattr(name)} '
+            f'attr.type="{attr_type}" />\n'
+            for name, attr_type in self.keys
+        )
+        return (
+            "<?xml version='1.0' encoding='utf-8'?>\n"
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+            f"{keys}"
+            '  <graph edgedefault="directed">\n'
+        )
+
+    def footer(self) -> str:
+        return "  </graph>\n</graphml>\n"
+
+    def node(self, attributes: Attributes) -> str:
+        data = "".join(
+            f"      <data key={quoteattr(key)}>{escape(value)}</data>\n"
+            for key, value in attributes.items()
+        )
+        return f"    <node id={quoteattr(attributes['id'])}>\n{data}    </node>\n"
+
+    def edge(self, source: str, target: str) -> str:
+        return f"    <edge source={quoteattr(source)} target={quoteattr(target)} />\n"
+
+
+class CytoscapeWriter(GraphWriter):
+    """Stream the organization graph as Cytoscape JSON.
+
+    The elements are a single array in which each element names its group, so
+    nodes and edges can be written in the order they are published.
+    """
+
+    def __init__(self, file: TextIO) -> None:
+        super().__init__(file)
+        self.separator = ""
+
+    def header(self) -> str:
+        return '{"elements": [\n'
+
+    def footer(self) -> str:
+        return "\n]}\n"
+
+    def write(self, text: str) -> None:
+        with self.lock:
+            self.file.write(self.separator + text)
+            self.separator = ",\n"
+
+    def node(self, attributes: Attributes) -> str:
+        return json.dumps({"group": "nodes", "data": attributes})
+
+    def edge(self, source: str, target: str) -> str:
+        return json.dumps(
+            {
+                "group": "edges",
+                "data": {"id": f"{source}-{target}", "source": source, "target": target},
+            }
+        )
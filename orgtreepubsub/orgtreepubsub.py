@@ -1,6 +1,8 @@
 from queue import Queue
 from concurrent.futures import ThreadPoolExecutor, Future, wait
-from typing import Callable, Iterable, Set
+from threading import Event
+from time import monotonic
+from typing import Callable, Iterable, Iterator, Literal, Optional, Set, TypeVar
 
 from boto3 import Session
 from botocore.exceptions import ClientError
@@ -13,6 +15,12 @@ from blinker import Signal
 
 Task = Callable[..., None]
 
+# COMPLETE means the crawl ran out of work. CANCELLED and TIMED_OUT mean the
+# subscribers saw only part of the organization.
+CrawlStatus = Literal["COMPLETE", "CANCELLED", "TIMED_OUT"]
+
+Page = TypeVar("Page")
+
 
 class OrgCrawler:
 
@@ -22,6 +30,7 @@ class OrgCrawler:
         self.client: OrganizationsClient = session.client("organizations")
 
         self.init: Task = lambda: None
+        self.cancelled = Event()
 
         self.on_organization = Signal()
         self.on_root = Signal()
@@ -30,14 +39,35 @@ class OrgCrawler:
         self.on_parentage = Signal()
         self.on_tag = Signal()
 
-    def crawl(self, max_workers: int = 4, loop_wait_timeout: float = 0.1) -> None:
+    def crawl(
+        self,
+        max_workers: int = 4,
+        loop_wait_timeout: float = 0.1,
+        timeout: Optional[float] = None,
+    ) -> CrawlStatus:
+        self.cancelled.clear()
+        deadline = None if timeout is None else monotonic() + timeout
+
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             futures: Set[Future[None]] = {executor.submit(self.init)}
 
             while futures:
 
+                if deadline is not None and monotonic() >= deadline:
+                    self.cancel()
+                    self.stop(executor, futures)
+                    return "TIMED_OUT"
+
+                if self.cancelled.is_set():
+                    self.stop(executor, futures)
+                    return "CANCELLED"
+
+                wait_timeout = loop_wait_timeout
+                if deadline is not None:
+                    wait_timeout = max(0, min(wait_timeout, deadline - monotonic()))
+
                 done, _ = wait(
-                    futures, timeout=loop_wait_timeout, return_when="FIRST_COMPLETED"
+                    futures, timeout=wait_timeout, return_when="FIRST_COMPLETED"
                 )
 
                 while not self.queue.empty():
@@ -48,6 +78,35 @@ class OrgCrawler:
 
                 futures -= done
 
+        return "CANCELLED" if self.cancelled.is_set() else "COMPLETE"
+
+    def cancel(self) -> None:
+        """Stop the crawl early.
+
+        Safe to call from a subscriber or from another thread. Queued tasks are
+        dropped and running tasks stop at the next page boundary.
+        """
+        self.cancelled.set()
+
+    def stop(self, executor: ThreadPoolExecutor, futures: Set["Future[None]"]) -> None:
+        # Wait for the running tasks so that nothing they queue outlives the crawl.
+        executor.shutdown(wait=True, cancel_futures=True)
+        while not self.queue.empty():
+            self.queue.get()
+
+        for future in futures:
+            if not future.cancelled():
+                raise_if_result_is_error_else_continue(future)
+
+    def until_cancelled(self, pages: Iterable[Page]) -> Iterator[Page]:
+        # Check before each request so that a cancelled crawl makes no more.
+        iterator = iter(pages)
+        while not self.cancelled.is_set():
+            try:
+                yield next(iterator)
+            except StopIteration:
+                return
+
     def publish_organization(self) -> None:
         def _work() -> None:
             org = self.describe_organization()
@@ -65,7 +124,7 @@ class OrgCrawler:
 
     def list_roots(self) -> Iterable[Root]:
         pages = self.client.get_paginator("list_roots").paginate()
-        for page in pages:
+        for page in self.until_cancelled(pages):
             for root in page["Roots"]:
                 yield Root.from_boto3(root)
 
@@ -81,7 +140,7 @@ class OrgCrawler:
             self.client.get_paginator("list_organizational_units_for_parent")
             .paginate(ParentId=parent.id)
         )
-        for page in pages:
+        for page in self.until_cancelled(pages):
             for orgunit in page["OrganizationalUnits"]:
                 yield OrgUnit.from_boto3(orgunit)
 
@@ -97,7 +156,7 @@ class OrgCrawler:
             self.client.get_paginator("list_accounts_for_parent")
             .paginate(ParentId=parent.id)
         )
-        for page in pages:
+        for page in self.until_cancelled(pages):
             for account in page["Accounts"]:
                 yield Account.from_boto3(account)
 
@@ -112,7 +171,7 @@ class OrgCrawler:
             self.client.get_paginator("list_tags_for_resource")
             .paginate(ResourceId=resource.id)
         )
-        for page in pages:
+        for page in self.until_cancelled(pages):
             for tag in page["Tags"]:
                 yield Tag.from_boto3(tag)
 
@@ -0,0 +1,121 @@
+# The tests use boto3 TypedDict access. See type_defs.py for why to suppress.
+# pyright: reportTypedDictNotRequiredAccess=false
+
+import csv
+import io
+from pathlib import Path
+
+import boto3
+import pytest
+from boto3 import Session
+from mypy_boto3_organizations import OrganizationsClient
+
+from .account_table import AccountTable, import_pyarrow
+from .orgtreepubsub import OrgCrawler
+from .type_defs import Account, Root
+
+
+@pytest.fixture(autouse=True)
+def new_org() -> None:
+    boto3.client("organizations").create_organization(FeatureSet="ALL")
+
+
+@pytest.fixture()
+def nested_account() -> Account:
+    client: OrganizationsClient = boto3.client("organizations")
+    root = client.list_roots()["Roots"][0]
+    ou1 = client.create_organizational_unit(ParentId=root["Id"], Name="OU1")["OrganizationalUnit"]
+    ou2 = client.create_organizational_unit(ParentId=ou1["Id"], Name="OU2")["OrganizationalUnit"]
+    ou3 = client.create_organizational_unit(ParentId=ou2["Id"], Name="OU3")["OrganizationalUnit"]
+    request = client.create_account(AccountName="Account1", Email="1@aws.com")["CreateAccountStatus"]
+    account = Account.from_boto3(client.describe_account(AccountId=request["AccountId"])["Account"])
+    client.move_account(AccountId=account.id, SourceParentId=root["Id"], DestinationParentId=ou3["Id"])
+    client.tag_resource(
+        ResourceId=account.id,
+        Tags=[{"Key": "Owner", "Value": "Alice"}, {"Key": "CostCenter", "Value": "42"}],
+    )
+    return account
+
+
+def crawl_into_table() -> AccountTable:
+    table = AccountTable()
+    crawler = OrgCrawler(Session())
+    crawler.init = crawler.publish_roots
+    crawler.on_root.connect(OrgCrawler.publish_orgunits_under_resource)
+    crawler.on_root.connect(OrgCrawler.publish_accounts_under_resource)
+    crawler.on_orgunit.connect(OrgCrawler.publish_orgunits_under_resource)
+    crawler.on_orgunit.connect(OrgCrawler.publish_accounts_under_resource)
+    crawler.on_account.connect(OrgCrawler.publish_tags)
+    table.connect(crawler)
+    crawler.crawl()
+    return table
+
+
+def row_for(columns: dict[str, list[object]], account_id: str) -> dict[str, object]:
+    index = columns["id"].index(account_id)
+    return {name: values[index] for name, values in columns.items()}
+
+
+def test_account_row_has_denormalized_ou_path(nested_account: Account) -> None:
+    client: OrganizationsClient = boto3.client("organizations")
+    root = Root.from_boto3(client.list_roots()["Roots"][0])
+    parent_id = client.list_parents(ChildId=nested_account.id)["Parents"][0]["Id"]
+
+    row = row_for(crawl_into_table().columns(), nested_account.id)
+
+    assert row["name"] == "Account1"
+    assert row["email"] == "1@aws.com"
+    assert row["status"] == "ACTIVE"
+    assert row["joined_timestamp"] == nested_account.joined_timestamp
+    assert row["parent_id"] == parent_id
+    assert row["ou_name_path"] == f"/{root.name}/OU1/OU2/OU3"
+    assert str(row["ou_id_path"]).startswith(f"/{root.id}/")
+    assert str(row["ou_id_path"]).endswith(f"/{parent_id}")
+    assert row["level_1_ou_name"] == "OU1"
+    assert row["level_2_ou_name"] == "OU2"
+
+
+def test_account_tags_are_pivoted_into_columns(nested_account: Account) -> None:
+    columns = crawl_into_table().columns()
+
+    assert list(columns)[-2:] == ["tag:CostCenter", "tag:Owner"]
+    row = row_for(columns, nested_account.id)
+    assert row["tag:Owner"] == "Alice"
+    assert row["tag:CostCenter"] == "42"
+
+
+def test_account_in_root_has_no_ou_levels() -> None:
+    client: OrganizationsClient = boto3.client("organizations")
+    mgmt_account_id = client.list_accounts()["Accounts"][0]["Id"]
+
+    row = row_for(crawl_into_table().columns(), mgmt_account_id)
+
+    assert row["level_1_ou_id"] is None
+    assert row["level_2_ou_id"] is None
+
+
+def test_writes_csv_with_header(nested_account: Account) -> None:
+    file = io.StringIO()
+
+    crawl_into_table().write_csv(file)
+
+    rows = list(csv.DictReader(io.StringIO(file.getvalue())))
+    row = next(r for r in rows if r["id"] == nested_account.id)
+    assert row["joined_timestamp"] == nested_account.joined_timestamp.isoformat()
+    assert row["level_1_ou_name"] == "OU1"
+    assert row["tag:Owner"] == "Alice"
+
+
+def test_writes_parquet_with_dictionary_encoded_strings(
+    nested_account: Account, tmp_path: Path
+) -> None:
+    pyarrow = import_pyarrow()
+    parquet = import_pyarrow("pyarrow.parquet")
+    path = str(tmp_path / "accounts.parquet")
+
+    crawl_into_table().write_parquet(path)
+
+    table = parquet.read_table(path)
+    assert pyarrow.types.is_dictionary(table.schema.field("ou_name_path").type)
+    assert pyarrow.types.is_timestamp(table.schema.field("joined_timestamp").type)
+    assert nested_account.id in table.column("id").to_pylist()
@@ -1,7 +1,10 @@
 # The tests use boto3 TypedDict access. See type_defs.py for why to suppress.
 # pyright: reportTypedDictNotRequiredAccess=false
 
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from threading import Event
+from typing import Any, Iterator
 from boto3 import Session
 import boto3
 from mypy_boto3_organizations import OrganizationsClient
@@ -293,3 +296,177 @@ def test_crawler_events_are_isolated() -> None:
 
     assert spy1.called
     assert not spy2.called
+
+
+def test_when_crawl_runs_out_of_work_returns_complete() -> None:
+    crawler = OrgCrawler(Session())
+    crawler.init = crawler.publish_roots
+
+    status = crawler.crawl()
+
+    assert status == "COMPLETE"
+
+
+def test_when_subscriber_cancels_crawl_stops_and_returns_cancelled() -> None:
+    client: OrganizationsClient = boto3.client("organizations")
+    root = client.list_roots()["Roots"][0]
+    parent_orgunit = OrgUnit.from_boto3(
+        client.create_organizational_unit(ParentId=root["Id"], Name="OU1")["OrganizationalUnit"]
+    )
+    client.create_organizational_unit(ParentId=parent_orgunit.id, Name="OU2")
+
+    def cancel_on_parent(sender: OrgCrawler, resource: OrgUnit) -> None:
+        if resource == parent_orgunit:
+            sender.cancel()
+
+    spy = Mock()
+    crawler = OrgCrawler(Session())
+    crawler.init = crawler.publish_roots
+    crawler.on_root.connect(OrgCrawler.publish_orgunits_under_resource)
+    crawler.on_orgunit.connect(cancel_on_parent)
+    crawler.on_orgunit.connect(OrgCrawler.publish_orgunits_under_resource)
+    crawler.on_orgunit.connect(spy)
+
+    status = crawler.crawl()
+
+    assert status == "CANCELLED"
+    spy.assert_called_once_with(crawler, resource=parent_orgunit)
+
+
+def test_when_timeout_expires_crawl_stops_and_returns_timed_out() -> None:
+    spy = Mock()
+    crawler = OrgCrawler(Session())
+    crawler.init = crawler.publish_roots
+    crawler.on_root.connect(spy)
+
+    status = crawler.crawl(timeout=0)
+
+    assert status == "TIMED_OUT"
+    assert not spy.called
+
+
+def test_cancelled_crawler_can_crawl_again() -> None:
+    spy = Mock()
+    crawler = OrgCrawler(Session())
+    crawler.init = crawler.publish_roots
+    crawler.on_root.connect(spy)
+    crawler.cancel()
+
+    status = crawler.crawl()
+
+    assert status == "COMPLETE"
+    assert spy.called
+
+
+@pytest.fixture()
+def crawl_stopping(mocker: MockerFixture) -> Event:
+    """Set when the crawl starts shutting down its executor."""
+    stopping = Event()
+    shutdown = ThreadPoolExecutor.shutdown
+
+    def notify_then_shutdown(
+        executor: ThreadPoolExecutor, wait: bool = True, *, cancel_futures: bool = False
+    ) -> None:
+        stopping.set()
+        shutdown(executor, wait=wait, cancel_futures=cancel_futures)
+
+    mocker.patch.object(ThreadPoolExecutor, "shutdown", notify_then_shutdown)
+    return stopping
+
+
+def test_tasks_queued_after_cancel_do_not_leak_into_next_crawl(
+    crawl_stopping: Event,
+) -> None:
+    client: OrganizationsClient = boto3.client("organizations")
+    root = client.list_roots()["Roots"][0]
+    client.create_organizational_unit(ParentId=root["Id"], Name="OU1")
+
+    def cancel_then_publish(sender: OrgCrawler, resource: Root) -> None:
+        sender.cancel()
+        assert crawl_stopping.wait(timeout=10)
+        sender.publish_orgunits_under_resource(resource)
+
+    spy = Mock()
+    crawler = OrgCrawler(Session())
+    crawler.init = crawler.publish_roots
+    crawler.on_root.connect(cancel_then_publish)
+    crawler.on_orgunit.connect(spy)
+
+    assert crawler.crawl() == "CANCELLED"
+    assert crawler.queue.empty()
+
+    crawler.init = lambda: None
+    crawler.crawl()
+
+    assert not spy.called
+
+
+def test_when_cancelled_raises_error_from_running_task(
+    mocker: MockerFixture, crawl_stopping: Event
+) -> None:
+    started = Event()
+
+    def list_organizational_units_for_parent(*args: Any, **kwargs: Any) -> None:
+        # Fail only after the crawl has been cancelled.
+        started.set()
+        assert crawl_stopping.wait(timeout=10)
+        raise ClientError(
+            {"Error": {"Message": "broken!", "Code": "OhNo"}},
+            "list_organizational_units_for_parent",
+        )
+
+    mocker.patch(
+        "moto.organizations.models.OrganizationsBackend.list_organizational_units_for_parent",
+        list_organizational_units_for_parent,
+    )
+
+    def publish_then_cancel(sender: OrgCrawler, resource: Root) -> None:
+        sender.publish_orgunits_under_resource(resource)
+        assert started.wait(timeout=10)
+        sender.cancel()
+
+    crawler = OrgCrawler(Session())
+    crawler.init = crawler.publish_roots
+    crawler.on_root.connect(publish_then_cancel)
+
+    with raises(OrganizationError) as exc:
+        crawler.crawl()
+    assert type(exc.value.__cause__) == ClientError
+
+
+def test_when_cancelled_pagination_stops_at_next_page(mocker: MockerFixture) -> None:
+    client: OrganizationsClient = boto3.client("organizations")
+    root = Root.from_boto3(client.list_roots()["Roots"][0])
+    requested_pages: list[int] = []
+
+    def paginate(**kwargs: Any) -> Iterator[dict[str, Any]]:
+        for page in range(1, 6):
+            requested_pages.append(page)
+            yield {
+                "Accounts": [
+                    {
+                        "Id": f"{page:012}",
+                        "Arn": f"arn:aws:organizations::{page:012}:account",
+                        "Email": f"{page}@aws.com",
+                        "Name": f"Account{page}",
+                        "Status": "ACTIVE",
+                        "JoinedMethod": "CREATED",
+                        "JoinedTimestamp": datetime.now(timezone.utc),
+                    }
+                ]
+            }
+
+    def cancel_on_second_page(sender: OrgCrawler, resource: Account) -> None:
+        if resource.name == "Account2":
+            sender.cancel()
+
+    spy = Mock()
+    crawler = OrgCrawler(Session())
+    mocker.patch.object(crawler.client, "get_paginator", return_value=Mock(paginate=paginate))
+    crawler.init = lambda: crawler.publish_accounts_under_resource(root)
+    crawler.on_account.connect(cancel_on_second_page)
+    crawler.on_account.connect(spy)
+
+    assert crawler.crawl() == "CANCELLED"
+    assert requested_pages == [1, 2]
+    assert spy.call_count == 2
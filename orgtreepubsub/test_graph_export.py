@@ -0,0 +1,190 @@
+# The tests use boto3 TypedDict access. See type_defs.py for why to suppress.
+# pyright: reportTypedDictNotRequiredAccess=false
+
+import io
+from typing import Any
+import json
+from xml.etree import ElementTree
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from pytest_mock import MockerFixture
+from boto3 import Session
+from mypy_boto3_organizations import OrganizationsClient
+
+from .graph_export import Attributes, CytoscapeWriter, GraphMLWriter, GraphWriter
+from .orgtreepubsub import OrgCrawler
+from .type_defs import Account, OrganizationError, OrgUnit, Root
+
+
+GRAPHML = "{http://graphml.graphdrawing.org/xmlns}"
+
+
+@pytest.fixture(autouse=True)
+def new_org() -> None:
+    boto3.client("organizations").create_organization(FeatureSet="ALL")
+
+
+def crawl_into(writer: GraphWriter) -> None:
+    crawler = OrgCrawler(Session())
+
+    def init() -> None:
+        crawler.publish_organization()
+        crawler.publish_roots()
+
+    crawler.init = init
+    crawler.on_root.connect(OrgCrawler.publish_orgunits_under_resource)
+    crawler.on_root.connect(OrgCrawler.publish_accounts_under_resource)
+    crawler.on_orgunit.connect(OrgCrawler.publish_orgunits_under_resource)
+    crawler.on_orgunit.connect(OrgCrawler.publish_accounts_under_resource)
+    with writer:
+        writer.connect(crawler)
+        crawler.crawl()
+
+
+def test_graphml_has_typed_keys_nodes_and_edges() -> None:
+    client: OrganizationsClient = boto3.client("organizations")
+    root = Root.from_boto3(client.list_roots()["Roots"][0])
+    orgunit = OrgUnit.from_boto3(
+        client.create_organizational_unit(ParentId=root.id, Name="OU1")["OrganizationalUnit"]
+    )
+    file = io.StringIO()
+
+    crawl_into(GraphMLWriter(file))
+
+    graphml = ElementTree.fromstring(file.getvalue())
+    keys = {k.get("attr.name"): k.get("attr.type") for k in graphml.iter(f"{GRAPHML}key")}
+    assert keys["joined_timestamp"] == "string"
+    nodes = {n.get("id"): n for n in graphml.iter(f"{GRAPHML}node")}
+    assert {"organization", "root", "organizational_unit", "account"} == {
+        n.findtext(f"{GRAPHML}data[@key='type']") for n in nodes.values()
+    }
+    edges = {(e.get("source"), e.get("target")) for e in graphml.iter(f"{GRAPHML}edge")}
+    assert (root.id, orgunit.id) in edges
+
+
+def test_graphml_flattens_timestamp_and_policy_types() -> None:
+    client: OrganizationsClient = boto3.client("organizations")
+    root = Root.from_boto3(client.list_roots()["Roots"][0])
+    client.enable_policy_type(RootId=root.id, PolicyType="SERVICE_CONTROL_POLICY")
+    mgmt_account = Account.from_boto3(client.list_accounts()["Accounts"][0])
+    file = io.StringIO()
+
+    crawl_into(GraphMLWriter(file))
+
+    graphml = ElementTree.fromstring(file.getvalue())
+    nodes = {n.get("id"): n for n in graphml.iter(f"{GRAPHML}node")}
+    assert (
+        nodes[mgmt_account.id].findtext(f"{GRAPHML}data[@key='joined_timestamp']")
+        == mgmt_account.joined_timestamp.isoformat()
+    )
+    assert (
+        nodes[root.id].findtext(f"{GRAPHML}data[@key='policy_types']")
+        == "SERVICE_CONTROL_POLICY"
+    )
+
+
+def test_graphml_escapes_attribute_values() -> None:
+    client: OrganizationsClient = boto3.client("organizations")
+    root = client.list_roots()["Roots"][0]
+    client.create_organizational_unit(ParentId=root["Id"], Name="R&D <\"lab\">")
+    file = io.StringIO()
+
+    crawl_into(GraphMLWriter(file))
+
+    graphml = ElementTree.fromstring(file.getvalue())
+    names = [d.text for d in graphml.iter(f"{GRAPHML}data") if d.get("key") == "name"]
+    assert "R&D <\"lab\">" in names
+
+
+@pytest.mark.parametrize("roots_first", [False, True])
+def test_organization_is_linked_to_root(roots_first: bool) -> None:
+    client: OrganizationsClient = boto3.client("organizations")
+    org_id = client.describe_organization()["Organization"]["Id"]
+    root = Root.from_boto3(client.list_roots()["Roots"][0])
+    file = io.StringIO()
+
+    def publish_organization(sender: OrgCrawler, **kwargs: Any) -> None:
+        sender.publish_organization()
+
+    def publish_roots(sender: OrgCrawler, **kwargs: Any) -> None:
+        sender.publish_roots()
+
+    crawler = OrgCrawler(Session())
+    if roots_first:
+        crawler.init = crawler.publish_roots
+        crawler.on_root.connect(publish_organization)
+    else:
+        crawler.init = crawler.publish_organization
+        crawler.on_organization.connect(publish_roots)
+    with GraphMLWriter(file) as writer:
+        writer.connect(crawler)
+        crawler.crawl()
+
+    graphml = ElementTree.fromstring(file.getvalue())
+    edges = [(e.get("source"), e.get("target")) for e in graphml.iter(f"{GRAPHML}edge")]
+    assert edges == [(org_id, root.id)]
+
+
+def test_cytoscape_json_has_nodes_and_edges() -> None:
+    client: OrganizationsClient = boto3.client("organizations")
+    root = Root.from_boto3(client.list_roots()["Roots"][0])
+    mgmt_account = Account.from_boto3(client.list_accounts()["Accounts"][0])
+    file = io.StringIO()
+
+    crawl_into(CytoscapeWriter(file))
+
+    elements = json.loads(file.getvalue())["elements"]
+    nodes = {e["data"]["id"]: e["data"] for e in elements if e["group"] == "nodes"}
+    edges = {(e["data"]["source"], e["data"]["target"]) for e in elements if e["group"] == "edges"}
+    assert nodes[mgmt_account.id]["joined_timestamp"] == mgmt_account.joined_timestamp.isoformat()
+    assert nodes[root.id]["type"] == "root"
+    assert (root.id, mgmt_account.id) in edges
+
+
+def test_cytoscape_json_is_valid_when_crawl_publishes_nothing() -> None:
+    file = io.StringIO()
+
+    with CytoscapeWriter(file):
+        pass
+
+    assert json.loads(file.getvalue()) == {"elements": []}
+
+
+@pytest.mark.parametrize("writer_class", [GraphMLWriter, CytoscapeWriter])
+def test_when_crawl_raises_document_is_left_unclosed(
+    writer_class: type[GraphWriter], mocker: MockerFixture
+) -> None:
+    def list_roots(*args: Any, **kwargs: Any) -> None:
+        raise ClientError(
+            {"Error": {"Message": "broken!", "Code": "OhNo"}}, "list_roots"
+        )
+
+    mocker.patch(
+        "moto.organizations.models.OrganizationsBackend.list_roots",
+        list_roots,
+    )
+    file = io.StringIO()
+
+    with pytest.raises(OrganizationError):
+        crawl_into(writer_class(file))
+
+    writer = writer_class(io.StringIO())
+    assert file.getvalue().startswith(writer.header())
+    assert not file.getvalue().endswith(writer.footer())
+
+
+def test_incomplete_writer_fails_when_instantiated() -> None:
+    class NodesOnlyWriter(GraphWriter):
+        def header(self) -> str:
+            return ""
+
+        def footer(self) -> str:
+            return ""
+
+        def node(self, attributes: Attributes) -> str:
+            return ""
+
+    with pytest.raises(TypeError):
+        NodesOnlyWriter(io.StringIO())  # type: ignore[abstract]